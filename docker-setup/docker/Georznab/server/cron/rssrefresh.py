@@ -15,11 +15,14 @@ Cron job example (runs at minute 30 every hour):
 import argparse
 import asyncio
 import os
+import random
 import sys
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
+from croniter import croniter
+
 # Add the parent directory to the path so we can import utils
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -40,6 +43,11 @@ DEFAULTS = {
 # Load settings from config file
 globals().update(load_settings(DEFAULTS, []))
 
+# Seconds a scheduled refresh waits for a running builder before skipping the run
+RSS_LOCK_TIMEOUT = 5
+# Held while a scheduled refresh runs, so overlapping checks skip instead of queueing
+_REFRESH_LOCK = asyncio.Lock()
+
 
 def get_file_age_hours(file_path: str) -> float:
     """
@@ -51,13 +59,13 @@ def get_file_age_hours(file_path: str) -> float:
     Returns:
         Age in hours, or float('inf') if file doesn't exist
     """
-    if not os.path.exists(file_path):
+    try:
+        file_mtime_ns = os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
         return float('inf')
     
-    file_mtime = os.path.getmtime(file_path)
-    current_time = time.time()
-    age_seconds = current_time - file_mtime
-    age_hours = age_seconds / 3600
+    age_ns = time.time_ns() - file_mtime_ns
+    age_hours = age_ns / 3_600_000_000_000
     
     return age_hours
 
@@ -87,73 +95,66 @@ def should_refresh(file_path: str, max_age_hours: int = 24) -> bool:
     return False
 
 
-async def refresh_rss() -> bool:
+async def refresh_rss() -> bool | None:
     """
     Refresh the RSS feed by calling the webhook run_requests function.
     
     Returns:
-        True if refresh was successful, False otherwise
+        True if refresh was successful, None if it was skipped because another run is busy, False otherwise
     """
-    try:
-        logger.info(f"🔄 Starting RSS refresh via webhook run_requests")
-        
-        # Import the webhook module and call run_requests
-        from routers import webhook
-        
-        # Call run_requests with no parameters to process both Movies and TV
-        result = await webhook.run_requests()
-        
-        if result == 0:
-            logger.info(f"✅ RSS refresh completed successfully")
-            return True
-        else:
-            logger.error(f"❌ RSS refresh failed with exit code {result}")
-            return False
+    if _REFRESH_LOCK.locked():
+        logger.info(f"⏭️ RSS refresh already running, skipping")
+        return None
+    async with _REFRESH_LOCK:
+        try:
+            logger.info(f"🔄 Starting RSS refresh via webhook run_requests")
+            
+            # Import the webhook module and call run_requests
+            from routers import webhook
+            import rss.builder
+            
+            # Process both Movies and TV, skipping the run if another builder holds the file lock
+            result = await webhook.run_requests(lock_timeout=RSS_LOCK_TIMEOUT)
             
-    except Exception as e:
-        logger.error(f"❌ RSS refresh failed with exception: {e}", exc_info=True)
-        return False
+            if result == 0:
+                logger.info(f"✅ RSS refresh completed successfully")
+                return True
+            elif result == rss.builder.EXIT_LOCKED:
+                logger.warning(f"⏭️ RSS refresh skipped, another builder run still holds the lock")
+                return None
+            else:
+                logger.error(f"❌ RSS refresh failed with exit code {result}")
+                return False
+                
+        except Exception as e:
+            logger.error(f"❌ RSS refresh failed with exception: {e}", exc_info=True)
+            return False
 
 
-def parse_cron_schedule(schedule: str) -> tuple[int, int, int, int, int]:
+def parse_cron_schedule(schedule: str) -> str:
     """
-    Parse a cron schedule string.
+    Validate a cron schedule string.
     
     Args:
         schedule: Cron string "minute hour day month weekday" (e.g., "30 * * * *")
         
     Returns:
-        Tuple of (minute, hour, day, month, weekday)
+        Schedule with full weekday names shortened to the abbreviations croniter expects
     """
     parts = schedule.split()
     if len(parts) != 5:
         raise ValueError(f"Invalid schedule format: {schedule}. Expected 'minute hour day month weekday'")
     
-    # Weekday mapping (Sunday=0, Monday=1, ..., Saturday=6)
-    weekday_map = {
-        'SUN': 0, 'SUNDAY': 0,
-        'MON': 1, 'MONDAY': 1,
-        'TUE': 2, 'TUESDAY': 2,
-        'WED': 3, 'WEDNESDAY': 3,
-        'THU': 4, 'THURSDAY': 4,
-        'FRI': 5, 'FRIDAY': 5,
-        'SAT': 6, 'SATURDAY': 6
-    }
-    
-    minute = int(parts[0]) if parts[0] != '*' else None
-    hour = int(parts[1]) if parts[1] != '*' else None
-    day = int(parts[2]) if parts[2] != '*' else None
-    month = int(parts[3]) if parts[3] != '*' else None
+    # Weekday names (e.g., FRIDAY -> FRI)
+    weekday_names = ('SUNDAY', 'MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY')
+    if parts[4].upper() in weekday_names:
+        parts[4] = parts[4][:3]
+    schedule = " ".join(parts)
     
-    # Parse weekday (supports numbers and strings)
-    if parts[4] == '*':
-        weekday = None
-    elif parts[4].upper() in weekday_map:
-        weekday = weekday_map[parts[4].upper()]
-    else:
-        weekday = int(parts[4])
+    if not croniter.is_valid(schedule):
+        raise ValueError(f"Invalid schedule format: {schedule}. Expected 'minute hour day month weekday'")
     
-    return minute, hour, day, month, weekday
+    return schedule
 
 
 def get_next_run_time(schedule: str) -> datetime:
@@ -166,65 +167,40 @@ def get_next_run_time(schedule: str) -> datetime:
     Returns:
         Next datetime when the job should run
     """
-    minute, hour, day, month, weekday = parse_cron_schedule(schedule)
-    now = datetime.now()
-    
-    # Start with current time
-    next_run = now.replace(second=0, microsecond=0)
-    
-    # Handle minute
-    if minute is not None:
-        if next_run.minute >= minute:
-            # Minute has passed this hour, move to next hour
-            next_run = next_run.replace(minute=minute) + timedelta(hours=1)
-        else:
-            # Minute hasn't passed yet this hour
-            next_run = next_run.replace(minute=minute)
-    else:
-        # Every minute - run immediately
-        return now
-    
-    # Handle hour
-    if hour is not None:
-        if next_run.hour >= hour:
-            # Hour has passed today, move to next day
-            next_run = next_run.replace(hour=hour) + timedelta(days=1)
-        else:
-            # Hour hasn't passed yet today
-            next_run = next_run.replace(hour=hour)
-    
-    # Handle day
-    if day is not None:
-        if next_run.day >= day:
-            # Day has passed this month, move to next month
-            next_run = next_run.replace(day=day) + timedelta(days=30)
-        else:
-            # Day hasn't passed yet this month
-            next_run = next_run.replace(day=day)
+    return croniter(schedule, datetime.now()).get_next(datetime)
+
+
+async def sleep_until(run_time: datetime, chunk_seconds: float = 300) -> None:
+    """
+    Sleep until a wall-clock time.
     
-    # Handle month
-    if month is not None:
-        if next_run.month >= month:
-            # Month has passed this year, move to next year
-            next_run = next_run.replace(month=month) + timedelta(days=365)
-        else:
-            # Month hasn't passed yet this year
-            next_run = next_run.replace(month=month)
+    The event loop sleeps on the monotonic clock, which stops during suspend and
+    ignores wall-clock changes, so the remaining time is recomputed after each chunk.
     
-    # Handle weekday (0=Sunday, 6=Saturday)
-    if weekday is not None:
-        # Calculate days until next occurrence of the weekday
-        # datetime.weekday() returns 0=Monday, 6=Sunday, but cron uses 0=Sunday, 6=Saturday
-        current_weekday = (next_run.weekday() + 1) % 7  # Convert to cron format (0=Sunday)
-        days_until_weekday = (weekday - current_weekday) % 7
-        if days_until_weekday == 0 and next_run.hour == hour and next_run.minute == minute:
-            # We're already at the right time on the right day
-            pass
-        else:
-            # Move to the next occurrence of the weekday
-            next_run = next_run + timedelta(days=days_until_weekday)
+    Args:
+        run_time: Local time to wake up at
+        chunk_seconds: Longest single sleep before checking the wall clock again
+    """
+    while (remaining := (run_time - datetime.now()).total_seconds()) > 0:
+        await asyncio.sleep(min(remaining, chunk_seconds))
+
+
+async def back_off(failures: int, action: str) -> int:
+    """
+    Wait before retrying after consecutive failures.
     
-    return next_run
+    Args:
+        failures: Consecutive failures before this one
+        action: What is being retried, for the log message
+        
+    Returns:
+        Updated count of consecutive failures
+    """
+    # Back off from 5 minutes up to an hour on repeated errors, with jitter to spread out retries
+    retry_seconds = min(300 * 2 ** failures, 3600) + random.uniform(0, 30)
+    logger.info(f"⏳ Retrying {action} in {retry_seconds // 60:.0f} minutes")
+    await asyncio.sleep(retry_seconds)
+    return failures + 1
 
 
 async def rss_refresh_cron():
@@ -241,29 +217,37 @@ async def rss_refresh_cron():
     logger.info(f"📁 Feed file: {feed_file}")
     logger.info(f"⏰ Max age: {max_age_hours} hours")
     
+    consecutive_failures = 0
+    retry_refresh = False
     while True:
         try:
-            # Calculate next run time
-            next_run = get_next_run_time(schedule)
-            now = datetime.now()
-            
-            # Calculate seconds until next run
-            seconds_until_next = (next_run - now).total_seconds()
-            
-            if seconds_until_next > 0:
-                logger.info(f"⏰ Next RSS refresh check in {seconds_until_next // 60:.0f} minutes at {next_run.strftime('%Y-%m-%d %H:%M')}")
-                await asyncio.sleep(seconds_until_next)
+            # A failed refresh is retried once its backoff ends instead of waiting for the next run
+            if not retry_refresh:
+                # Validate inside the loop so a bad schedule is logged and retried like any other error
+                next_run = get_next_run_time(parse_cron_schedule(schedule))
+                now = datetime.now()
+                
+                # Calculate seconds until next run
+                seconds_until_next = (next_run - now).total_seconds()
+                
+                if seconds_until_next > 0:
+                    logger.info(f"⏰ Next RSS refresh check in {seconds_until_next // 60:.0f} minutes at {next_run.strftime('%Y-%m-%d %H:%M')}")
+                    await sleep_until(next_run)
+            retry_refresh = False
             
             # Check if refresh is needed
-            if should_refresh(feed_file, max_age_hours):
-                await refresh_rss()
-            else:
+            if not should_refresh(feed_file, max_age_hours):
                 logger.info("😴 No RSS refresh needed")
+            elif await refresh_rss() is False:
+                # Skipped runs return None and wait for the next run like a success
+                retry_refresh = True
+                consecutive_failures = await back_off(consecutive_failures, "RSS refresh")
+                continue
+            consecutive_failures = 0
                 
         except Exception as e:
             logger.error(f"❌ RSS refresh cron job error: {e}", exc_info=True)
-            # Wait 5 minutes before retrying on error
-            await asyncio.sleep(300)
+            consecutive_failures = await back_off(consecutive_failures, "RSS refresh cron job")
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -310,6 +294,9 @@ async def main(argv: list[str] | None = None) -> int:
             if success:
                 logger.info("🎉 RSS refresh cron job completed successfully")
                 return 0
+            elif success is None:
+                logger.info("⏭️ RSS refresh skipped - cron job completed")
+                return 0
             else:
                 logger.error("💥 RSS refresh cron job failed")
                 return 1
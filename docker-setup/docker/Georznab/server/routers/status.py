@@ -1,9 +1,8 @@
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
 # Docker status check
 @router.get("/status")
-async def status():
-    return JSONResponse(content={"status": "healthy"}, status_code=200)
+async def status() -> dict[str, str]:
+    return {"status": "healthy"}
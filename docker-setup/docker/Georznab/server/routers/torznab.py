@@ -2,13 +2,20 @@ from fastapi import APIRouter, Query
 from fastapi.responses import Response
 from collections import defaultdict
 import xml.sax.saxutils as saxutils
-from feedgen.feed import FeedGenerator
-from feedgen.ext.torrent import TorrentExtension, TorrentEntryExtension
 from datetime import datetime, timezone
+from email.utils import format_datetime
+import functools
 import json
+import os
 import re
 from utils.settings import load_settings
 
+# Parse the feed file with orjson if available, otherwise use the standard library
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 router = APIRouter()
 
 # Define defaults
@@ -23,8 +30,21 @@ DEFAULTS = {
     "FEED_LANGUAGE": "en",
     "NS": {"torznab": "http://torznab.com/schemas/2015/feed"},
 }
-# Export config vars to globals
-globals().update(load_settings(DEFAULTS, ["API_KEY"]))
+# Export config vars to module constants
+_settings = load_settings(DEFAULTS, ["API_KEY"])
+API_KEY = _settings["API_KEY"]
+API_ENDPOINT = _settings["API_ENDPOINT"]
+FEED_FILE = _settings["FEED_FILE"]
+FEED_TITLE = _settings["FEED_TITLE"]
+FEED_LINK = _settings["FEED_LINK"]
+FEED_IMAGE = _settings["FEED_IMAGE"]
+FEED_DESCRIPTION = _settings["FEED_DESCRIPTION"]
+FEED_LANGUAGE = _settings["FEED_LANGUAGE"]
+NS = _settings["NS"]
+
+# Namespace of the legacy torrent RSS elements
+TORRENT_NS = "http://xmlns.ezrss.it/0.1/dtd/"
+CATEGORY_SCHEME = "http://torznab.com/categories"
 
 # Set default categories
 CATEGORIES = [
@@ -51,17 +71,31 @@ def build_cats_tree(categories):
     # Build quick dict of id -> parent
     parent_map = {c["id"]: c["parent"] for c in categories}
     lookup = {}
-    def find_root(cat_id):
+    for cat_id in parent_map:
         # Follow parent chain until root
-        parent = parent_map.get(cat_id)
-        if parent is None:
-            return cat_id
-        return find_root(parent)
-    for c in categories:
-        lookup[c["id"]] = find_root(c["id"])
+        root = cat_id
+        while parent_map.get(root) is not None:
+            root = parent_map[root]
+        lookup[cat_id] = root
     return lookup
 CAT_LOOKUP = build_cats_tree(CATEGORIES)
 
+def build_cats_labels(categories):
+    """Build a mapping of (parent label, label) to category ID, keying main categories on a None parent."""
+    root_labels = {c["id"]: c["label"].lower() for c in categories if c["parent"] is None}
+    labels = {}
+    for c in categories:
+        if c["parent"] is None:
+            key = (None, c["label"].lower())
+        elif c["parent"] in root_labels:
+            key = (root_labels[c["parent"]], c["label"].lower())
+        else:
+            continue
+        # Keep the first match, same as a scan over the list would
+        labels.setdefault(key, c["id"])
+    return labels
+CAT_IDS = build_cats_labels(CATEGORIES)
+
 def cats_to_xml(categories_flat: list) -> str:
     """
     Generate <categories> XML from a flat list of dicts with keys: id, label, parent.
@@ -80,93 +114,209 @@ def cats_to_xml(categories_flat: list) -> str:
             grouped[parent].append((cat_id, label))
     
     # Sort main categories and subcategories by ID
-    xml = "  <categories>\n"
+    parts = ["  <categories>\n"]
     for cat_id in sorted(main_cats.keys()):
         label = saxutils.escape(main_cats[cat_id])
-        xml += f'    <category id="{cat_id}" name="{label}">\n'
+        parts.append(f'    <category id="{cat_id}" name="{label}">\n')
         for sub_id, sub_label in sorted(grouped.get(cat_id, [])):
-            xml += f'      <subcat id="{sub_id}" name="{saxutils.escape(sub_label)}" />\n'
-        xml += f'    </category>\n'
-    xml += "  </categories>"
-    return xml
+            parts.append(f'      <subcat id="{sub_id}" name="{saxutils.escape(sub_label)}" />\n')
+        parts.append('    </category>\n')
+    parts.append("  </categories>")
+    return "".join(parts)
+
+# Caps XML only depends on settings and categories, so build it once at import
+CAPS_XML = f"""<?xml version="1.0" encoding="UTF-8"?>
+<caps xmlns:torrent="{NS['torznab']}">
+  <server version="1.0" title="{FEED_TITLE}" strapline="Torznab Indexer"
+      email="admin@example.com" url="{FEED_LINK}"
+      image="{FEED_IMAGE}" />
+  <limits max="0" default="0" />
+  <retention>365</retention>
+  <registration available="yes" open="yes" />
+
+  <searching>
+    <search available="yes" supportedParams="q,offset,limit" />
+    <tv-search available="yes" supportedParams="q,tvdbid,season,ep,offset,limit" />
+    <movie-search available="yes" supportedParams="q,imdbid,genre,offset,limit" />
+    <audio-search available="no" supportedParams="q" />
+    <book-search available="no" supportedParams="q" />
+    <details available="yes" supportedParams="q" />
+  </searching>
+
+{cats_to_xml(CATEGORIES)}
+
+  <tags>
+    <tag name="anonymous" description="Uploader is anonymous" />
+    <tag name="trusted" description="Uploader has high reputation" />
+    <tag name="internal" description="Uploader is an internal release group" />
+  </tags>
+</caps>""".encode("utf-8")
 
 def get_cat_id(parent, label):
     """Return the category id for a given parent and label."""
-    parent_id = get_cat_id(None, parent) if parent is not None else None
-    for cat in CATEGORIES:
-        if (cat['parent'] is None or cat['parent'] == parent_id) and cat['label'].lower() == label.lower():
-            return cat['id']
-    return None  # not found
+    label = label.lower()
+    if parent:
+        cat_id = CAT_IDS.get((parent.lower(), label))
+        if cat_id is not None:
+            return cat_id
+    # Main categories match regardless of parent
+    return CAT_IDS.get((None, label))  # None if not found
 
-def filter_items(torrents, q=None, cat=None, extra_filters=None):
-    """Filter torrents by q, cat_ids, and any additional filters."""
-    # Start with default filters
-    filters = []
+# Parsed torrents are cached until the feed file is rewritten
+_TORRENTS_CACHE = {"mtime_ns": None, "data": None, "by_descr_link": None}
+
+def _load_torrents(json_path):
+    """
+    Load the torrents JSON sorted by score and date, reusing the cached list while the file's mtime is unchanged.
+    Filtering preserves this order, so results can be paginated without sorting again.
+    Returns the sorted list and an index of items by descrLink.
+    """
+    try:
+        mtime_ns = os.stat(json_path).st_mtime_ns
+    except FileNotFoundError:
+        print(f"Warning: {json_path} not found.")
+        return [], {}
+    if _TORRENTS_CACHE["mtime_ns"] == mtime_ns:
+        return _TORRENTS_CACHE["data"], _TORRENTS_CACHE["by_descr_link"]
+    try:
+        with open(json_path, "rb") as f:
+            torrents = json_loads(f.read())
+    except FileNotFoundError:
+        print(f"Warning: {json_path} not found.")
+        return [], {}
+    except json.JSONDecodeError:
+        print(f"Error: {json_path} contains invalid JSON.")
+        return [], {}
+    torrents = sorted(torrents, key=lambda x: (x.get("score") or 0, x.get("pubDate") or 0), reverse=True)
+    # Index in reverse so the first item wins for a duplicate descrLink
+    by_descr_link = {x.get("descrLink"): x for x in reversed(torrents)}
+    _TORRENTS_CACHE.update(mtime_ns=mtime_ns, data=torrents, by_descr_link=by_descr_link)
+    return torrents, by_descr_link
+
+@functools.lru_cache(maxsize=256)
+def _build_q_regex(q):
+    """Compile a case-insensitive pattern for q that treats any run of non-word characters or underscores as optional separators."""
+    parts = []
+    in_separator = False
+    for ch in q:
+        if ch.isalnum():
+            if in_separator:
+                parts.append(r'[\W_]*')
+                in_separator = False
+            parts.append(re.escape(ch))
+        else:
+            in_separator = True
+    if in_separator:
+        parts.append(r'[\W_]*')
+    return re.compile("".join(parts), re.IGNORECASE)
+
+def _matches_cat(type_name, categories, cat_ids):
+    """Return True if any category label of an item, or its root category, is in cat_ids."""
+    # Look for category field and handle strings, then parse as array
+    if not isinstance(categories, list):
+        categories = [categories or "Other"]
+    for cat_label in categories:
+        # Match either the subcategory itself or its root category
+        cat_id = get_cat_id(type_name, cat_label)
+        if cat_id in cat_ids or CAT_LOOKUP.get(cat_id) in cat_ids:
+            return True
+    return False
+
+def filter_items(torrents, q=None, cat=None, type_name=None, tvdbid=None, season=None, ep=None, imdbid=None, genre=None):
+    """Filter torrents by q, cat_ids, and any search-specific fields in a single pass."""
+    q_search = None
     if q:
-        # Replace any non-word characters or underscore with a regex search phrase to search the fileName
-        q_pattern = re.sub(r'[\W_]+', r'[\\W_]*', re.escape(q))
-        q_regex = re.compile(q_pattern, re.IGNORECASE)
-        filters.append(lambda x, regex=q_regex: regex.search(x.get("fileName", "")))
+        # Keep the bound search method to skip the attribute lookup per item
+        q_search = _build_q_regex(q).search
+    cat_ids = None
     if cat:
-        cat_ids = [c.strip() for c in cat.split(",") if c.strip()]
-        filters.append(lambda x: any(
-            (get_cat_id(x.get("type"), cat_label) in cat_ids) or
-            (CAT_LOOKUP.get(get_cat_id(x.get("type"), cat_label)) in cat_ids)
-            for cat_label in (lambda c=x.get("category", ["Other"]): c if isinstance(c, list) else [c])()
-        ))
-    # Merge in any extra filters
-    if extra_filters:
-        filters.extend(extra_filters)
-    results = []
-    for x in torrents:
-        if all(f(x) for f in filters):
-            results.append(x)
+        cat_ids = frozenset(c.strip() for c in cat.split(",") if c.strip())
 
-    return results
+    # Unset arguments are skipped, so each item only pays for the checks the query asked for
+    def keep(x):
+        if q_search is not None and not q_search(x.get("fileName", "")):
+            return False
+        if cat_ids is not None and not _matches_cat(x.get("type"), x.get("category"), cat_ids):
+            return False
+        if type_name is not None and type_name not in x.get("type"):
+            return False
+        if tvdbid is not None and x.get("tvdbid") != tvdbid:
+            return False
+        if season is not None and x.get("season") != season:
+            return False
+        if ep is not None and x.get("episode") != ep:
+            return False
+        if imdbid is not None and x.get("imdbid") != imdbid:
+            return False
+        if genre is not None and genre not in x.get("genre", []):
+            return False
+        return True
 
-def generate_rss(items, offset=0, limit=0):
-    # Create feed using config
-    fg = FeedGenerator()
-    fg.load_extension('torrent')
-    fg.title(globals().get('FEED_TITLE'))
-    fg.link(href=globals().get('FEED_LINK'))
-    fg.description(globals().get('FEED_DESCRIPTION'))
-    fg.language(globals().get('FEED_LANGUAGE'))
+    return [x for x in torrents if keep(x)]
 
-    # Sort items first, then apply pagination
-    sorted_items = sorted(items, key=lambda x: (x.get("score"), x.get("pubDate")), reverse=True)
-    if limit == 0:
-        limit = len(sorted_items) - offset
-    paginated_items = sorted_items[offset:offset + limit]
-
-    for t in paginated_items:
-        fe = fg.add_entry()
-        fe.id(t.get("descrLink"))
-        fe.title(t.get("fileName"))
-        # The link resets the permalink value, so set permalink=True below.
-        # The relationship type (rel) must be enclosure for Sonarr to grab torrents.
-        fe.link(href=t.get("fileUrl"))
-        fe.enclosure(url=t.get("fileUrl"), length=t.get("fileSize", 0), type="application/x-bittorrent")
-        fe.guid(guid=f"{globals().get('FEED_LINK')}/api?apikey={globals().get('API_KEY')}&t=details&q={t.get('descrLink')}", permalink=True)
-        pub_date = datetime.fromtimestamp(t.get("pubDate"), tz=timezone.utc)
-        fe.pubDate(pub_date)
+def _render_rss(items) -> bytes:
+    """Render an RSS 2.0 feed of the given items with torrent and torznab attributes."""
+    escape = saxutils.escape
+    quoteattr = saxutils.quoteattr
+    guid_base = f"{FEED_LINK}/api?apikey={API_KEY}&t=details&q="
+    parts = [f"""<?xml version='1.0' encoding='UTF-8'?>
+<rss xmlns:torrent={quoteattr(TORRENT_NS)} xmlns:torznab={quoteattr(NS['torznab'])} version="2.0">
+  <channel>
+    <title>{escape(str(FEED_TITLE))}</title>
+    <link>{escape(str(FEED_LINK))}</link>
+    <description>{escape(str(FEED_DESCRIPTION))}</description>
+    <language>{escape(str(FEED_LANGUAGE))}</language>
+    <lastBuildDate>{format_datetime(datetime.now(timezone.utc))}</lastBuildDate>
+"""]
+    for t in items:
+        file_url = str(t.get("fileUrl"))
+        size = quoteattr(str(t.get("fileSize", 0)))
+        seeders = t.get("nbSeeders", 0)
+        leechers = t.get("nbLeechers", 0)
+        pub_date = format_datetime(datetime.fromtimestamp(t.get("pubDate"), tz=timezone.utc))
         # Look for category field and handle strings, then parse as array
-        for cat_label in (lambda c=t.get("category", ["Other"]): c if isinstance(c, list) else [c])():
-            fe.category(
-                term=cat_label,
-                scheme="http://torznab.com/categories",
-                label=get_cat_id(t.get("type"), cat_label),
-            )
+        categories = t.get("category")
+        if not isinstance(categories, list):
+            categories = [categories or "Other"]
+        cat_ids = [get_cat_id(t.get("type"), cat_label) for cat_label in categories]
+        # Torznab category attributes must be numeric, so unknown labels fall back to the root id of the item type
+        root_id = CAT_IDS.get((None, str(t.get("type") or "").lower()))
+        attr_ids = []
+        for cat_id in cat_ids:
+            cat_id = root_id if cat_id is None else cat_id
+            if cat_id is not None and cat_id not in attr_ids:
+                attr_ids.append(cat_id)
+        # The link is the torrent file and the enclosure type must be set for Sonarr to grab torrents
+        parts.append(f"""    <item>
+      <title>{escape(str(t["fileName"]))}</title>
+      <link>{escape(file_url)}</link>
+      <guid isPermaLink="true">{escape(guid_base + str(t.get("descrLink")))}</guid>
+""")
+        for cat_label, cat_id in zip(categories, cat_ids):
+            parts.append(f"""      <category domain="{CATEGORY_SCHEME}">{escape(str(cat_label if cat_id is None else cat_id))}</category>\n""")
+        parts.append(f"""      <enclosure url={quoteattr(file_url)} length={size} type="application/x-bittorrent"/>
+      <pubDate>{pub_date}</pubDate>
+      <torrent:filename>{escape(str(t["fileName"]))}</torrent:filename>
+      <torrent:contentlength>{escape(str(t.get("fileSize", 0)))}</torrent:contentlength>
+      <torrent:seed>{escape(str(seeders))}</torrent:seed>
+      <torrent:peers>{escape(str(leechers))}</torrent:peers>
+      <torznab:attr name="size" value={size}/>
+      <torznab:attr name="seeders" value={quoteattr(str(seeders))}/>
+      <torznab:attr name="peers" value={quoteattr(str((seeders or 0) + (leechers or 0)))}/>
+""")
+        for cat_id in attr_ids:
+            parts.append(f"""      <torznab:attr name="category" value={quoteattr(str(cat_id))}/>\n""")
+        parts.append("    </item>\n")
+    parts.append("  </channel>\n</rss>\n")
+    return "".join(parts).encode("utf-8")
 
-        # Required Torznab attributes
-        fe.torrent.filename(t["fileName"])
-        fe.torrent.contentlength(str(t.get("fileSize", 0)))
-        fe.torrent.seeds(str(t.get("nbSeeders", 0)))
-        fe.torrent.peers(str(t.get("nbLeechers", 0)))
-
-    return fg.rss_str(pretty=True)
+def generate_rss(items, offset=0, limit=0):
+    """Paginate items, already sorted by score and date, and render them as RSS."""
+    if limit == 0:
+        return _render_rss(items[offset:])
+    return _render_rss(items[offset:offset + limit])
 
-@router.get(globals().get('API_ENDPOINT'))
+@router.get(API_ENDPOINT)
 def torznab_api(
     apikey: str = Query(None),
     t: str = Query(...),
@@ -181,23 +331,15 @@ def torznab_api(
     limit: int = Query(0, description="Maximum number of results to return"),
 ):
     # Load torrents JSON
-    torrents = []
-    json_path = globals().get('FEED_FILE')
-    try:
-        with open(json_path) as f:
-            torrents = json.load(f)
-    except FileNotFoundError:
-        print(f"Warning: {json_path} not found.")
-    except json.JSONDecodeError:
-        print(f"Error: {json_path} contains invalid JSON.")
+    torrents, by_descr_link = _load_torrents(FEED_FILE)
 
     # API key check
-    if apikey != globals().get('API_KEY'):
+    if apikey != API_KEY:
         apikey_error = f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:torznab="{globals().get('NS')['torznab']}">
+<rss version="2.0" xmlns:torznab="{NS['torznab']}">
   <channel>
-    <title>{globals().get('FEED_TITLE')}</title>
-    <link>{globals().get('FEED_LINK')}</link>
+    <title>{FEED_TITLE}</title>
+    <link>{FEED_LINK}</link>
     <description>Indexer Error</description>
     <error code="1001" description="Missing or invalid API key"/>
   </channel>
@@ -205,61 +347,25 @@ def torznab_api(
         return Response(content=apikey_error, media_type="application/xml")
 
     if t == "caps":
-        # Minimal caps XML
-        caps_xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<caps xmlns:torrent="{globals().get('NS')['torznab']}">
-  <server version="1.0" title="{globals().get('FEED_TITLE')}" strapline="Torznab Indexer"
-      email="admin@example.com" url="{globals().get('FEED_LINK')}"
-      image="{globals().get('FEED_IMAGE')}" />
-  <limits max="0" default="0" />
-  <retention>365</retention>
-  <registration available="yes" open="yes" />
-
-  <searching>
-    <search available="yes" supportedParams="q,offset,limit" />
-    <tv-search available="yes" supportedParams="q,tvdbid,season,ep,offset,limit" />
-    <movie-search available="yes" supportedParams="q,imdbid,genre,offset,limit" />
-    <audio-search available="no" supportedParams="q" />
-    <book-search available="no" supportedParams="q" />
-    <details available="yes" supportedParams="q" />
-  </searching>
-
-{cats_to_xml(CATEGORIES)}
-
-  <tags>
-    <tag name="anonymous" description="Uploader is anonymous" />
-    <tag name="trusted" description="Uploader has high reputation" />
-    <tag name="internal" description="Uploader is an internal release group" />
-  </tags>
-</caps>"""  # type: ignore
-        return Response(content=caps_xml, media_type="application/xml")
+        return Response(content=CAPS_XML, media_type="application/xml")
 
     elif t == "search":
         # Return all items matching q (generic search)
-        items = filter_items(torrents, q=q, cat=cat, extra_filters=None)
+        items = filter_items(torrents, q=q, cat=cat)
         return Response(content=generate_rss(items, offset, limit), media_type="application/xml")
 
     elif t == "tvsearch":
         # Filter TV items by q, season, ep
-        items = filter_items(torrents, q=q, cat=cat, extra_filters=[
-            lambda x: ("TV" in x.get("type")),
-            lambda x: (tvdbid is None or x.get("tvdbid") == tvdbid),
-            lambda x: (season is None or x.get("season") == season),
-            lambda x: (ep is None or x.get("episode") == ep),
-        ])
+        items = filter_items(torrents, q=q, cat=cat, type_name="TV", tvdbid=tvdbid, season=season, ep=ep)
         return Response(content=generate_rss(items, offset, limit), media_type="application/xml")
 
     elif t == "movie":
         # Filter movie items
-        items = filter_items(torrents, q=q, cat=cat, extra_filters=[
-            lambda x: ("Movies" in x.get("type")),
-            lambda x: (imdbid is None or x.get("imdbid") == imdbid),
-            lambda x: (genre is None or genre in x.get("genre", [])),
-        ])
+        items = filter_items(torrents, q=q, cat=cat, type_name="Movies", imdbid=imdbid, genre=genre)
         return Response(content=generate_rss(items, offset, limit), media_type="application/xml")
 
     elif t == "details":
-        item = next((x for x in torrents if x.get("descrLink") == q), None)
+        item = by_descr_link.get(q)
         if not item:
             return Response(status_code=404, content="Item not found")
         return Response(content=generate_rss([item]), media_type="application/xml")
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Request, HTTPException, Header, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request, Response, HTTPException, Header, Query
 from utils.settings import load_settings
+from concurrent.futures import ThreadPoolExecutor
 import rss.builder
 import threading
 import asyncio
 
+# Parse webhook bodies with orjson if available, otherwise use the standard library
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Routes declare return types so FastAPI serializes them straight to JSON bytes
 router = APIRouter()
 
 # Define defaults
@@ -14,14 +21,38 @@ DEFAULTS = {
     "FEED_FILE": "/app/data/torrents.json",
     "WEBHOOK_WAIT": 30,
 }
-# Export config vars to globals
-globals().update(load_settings(DEFAULTS, ["WEBHOOK_KEY"]))
+# Export config vars to module constants
+_settings = load_settings(DEFAULTS, ["WEBHOOK_KEY"])
+WEBHOOK_KEY = _settings["WEBHOOK_KEY"]
+WEBHOOK_ENDPOINT = _settings["WEBHOOK_ENDPOINT"]
+FEED_FILE = _settings["FEED_FILE"]
+WEBHOOK_WAIT = _settings["WEBHOOK_WAIT"]
+
+# Run the rssbuilder in its own small pool so bursts of webhooks queue up instead of spawning threads
+RSS_MAX_WORKERS = 2
+_RSS_EXECUTOR = ThreadPoolExecutor(max_workers=RSS_MAX_WORKERS, thread_name_prefix="rss-builder")
+_RSS_SEMAPHORE = asyncio.Semaphore(RSS_MAX_WORKERS)
+
+# Builder runs in progress, keyed on (type_name, external_id, lock_timeout) so duplicate requests share one run.
+# The lock timeout is part of the key so a run that may give up early is never shared with one that waits.
+_INFLIGHT: dict[tuple, asyncio.Task] = {}
 
-async def run_requests(type_name: str = None, external_id: str = None) -> int:
+async def run_requests(type_name: str = None, external_id: str = None, lock_timeout: float = None) -> int:
+    """Run the rssbuilder script, or wait on an identical run that is already in progress"""
+    key = (type_name, external_id, lock_timeout)
+    task = _INFLIGHT.get(key)
+    if task is None or task.done():
+        task = asyncio.create_task(_run_requests(type_name=type_name, external_id=external_id, lock_timeout=lock_timeout))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda t: _INFLIGHT.pop(key) if _INFLIGHT.get(key) is t else None)
+    # Shield the shared run so one cancelled caller does not cancel it for the others
+    return await asyncio.shield(task)
+
+async def _run_requests(type_name: str = None, external_id: str = None, lock_timeout: float = None) -> int:
     """Run the rssbuilder script to search for torrents and write them to the feed file"""
     try:
         # Build command arguments
-        args = ["--log", "--publish", globals().get('FEED_FILE')]
+        args = ["--log", "--publish", FEED_FILE]
         
         # Add type parameter if specified
         if type_name and type_name in ['Movies', 'TV']:
@@ -29,11 +60,16 @@ async def run_requests(type_name: str = None, external_id: str = None) -> int:
         
         # Add external ID parameter if specified
         if external_id:
-            args.extend(["--external", external_id])
+            args.extend(["--external", str(external_id)])
+        
+        # Give up instead of queueing behind another run if a lock timeout is set
+        if lock_timeout is not None:
+            args.extend(["--lock-timeout", str(lock_timeout)])
         
-        # Run the blocking rssbuilder.main() in a thread pool
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, rss.builder.main, args)
+        # Run the blocking rssbuilder.main() in the bounded thread pool
+        async with _RSS_SEMAPHORE:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(_RSS_EXECUTOR, rss.builder.main, args)
         return result
         
     except Exception as e:
@@ -42,9 +78,10 @@ async def run_requests(type_name: str = None, external_id: str = None) -> int:
 
 @router.get("/webhook")
 async def webhook_get(
+    response: Response,
     type: str = Query(None, description="Type of content to search for: 'Movies' or 'TV'"),
     id: str = Query(None, description="External ID for the wanted video (TMDB/TVDB ID)")
-):
+) -> dict[str, str | int]:
     """Run the requests.py script to search for torrents and write them to the feed file"""
     result = await run_requests(type_name=type, external_id=id)
     
@@ -55,35 +92,30 @@ async def webhook_get(
         if id is not None:
             message += f" with external ID {id}"
         
-        return JSONResponse(
-            content={
-                "status": "success", 
-                "message": message
-            }, 
-            status_code=200
-        )
+        return {
+            "status": "success", 
+            "message": message
+        }
     else:
-        return JSONResponse(
-            content={
-                "status": "error", 
-                "message": "Requests script failed",
-                "exit_code": result
-            }, 
-            status_code=500
-        )
+        response.status_code = 500
+        return {
+            "status": "error", 
+            "message": "Requests script failed",
+            "exit_code": result
+        }
 
 @router.post("/webhook")
-async def webhook(request: Request, authorization: str = Header(None)):
+async def webhook(request: Request, response: Response, authorization: str = Header(None)) -> dict[str, str]:
     # Check header exists
     if not authorization:
         raise HTTPException(status_code=401, detail="Missing Authorization header")
     # Expect format: "<API_KEY>"
-    elif authorization != WEBHOOK_KEY:  # pyright: ignore[reportUndefinedVariable]
+    elif authorization != WEBHOOK_KEY:
         raise HTTPException(status_code=403, detail="Invalid API key")
 
     # Parse JSON payload
     try:
-        payload = await request.json()
+        payload = json_loads(await request.body())
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid JSON")
 
@@ -104,21 +136,25 @@ async def webhook(request: Request, authorization: str = Header(None)):
             requested_seasons = []
             for extra_item in payload.get("extra", []):
                 if extra_item.get("name") == "Requested Seasons":
-                    requested_seasons += extra_item.get("value")
+                    seasons = extra_item.get("value") or []
+                    # Jellyseerr sends the seasons as a comma-separated string
+                    if isinstance(seasons, str):
+                        seasons = [season.strip() for season in seasons.split(",") if season.strip()]
+                    requested_seasons.extend(seasons)
 
             # Build external parameter with tvdbId and season
             if requested_seasons:
-                external_id = f"{tvdb_id}:{requested_seasons.join(',')}"
+                external_id = f"{tvdb_id}:{','.join(str(s) for s in requested_seasons)}"
             else:
                 external_id = tvdb_id
 
-        print(f"Webhook received, processing {type_name} requests in background after {globals().get('WEBHOOK_WAIT')} seconds: {payload}")
+        print(f"Webhook received, processing {type_name} requests in background after {WEBHOOK_WAIT} seconds: {payload}")
         
         # Define the background processing function
         async def process_request():
             try:
                 # Wait x seconds before processing
-                await asyncio.sleep(globals().get('WEBHOOK_WAIT', 30))
+                await asyncio.sleep(WEBHOOK_WAIT)
                 
                 # Call the shared run_requests function
                 result = await run_requests(type_name=type_name, external_id=external_id)
@@ -132,10 +168,11 @@ async def webhook(request: Request, authorization: str = Header(None)):
         
         # Start background task
         asyncio.create_task(process_request())
-        return JSONResponse(content={"status": "ok"}, status_code=202) # 202 Accepted for async processing
+        response.status_code = 202 # 202 Accepted for async processing
+        return {"status": "ok"}
         
     else:
         print(f"Webhook received with no handler: {payload}")
-        return JSONResponse(content={"status": "ok"}, status_code=200)
+        return {"status": "ok"}
 
 
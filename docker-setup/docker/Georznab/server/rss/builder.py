@@ -1,16 +1,35 @@
 import argparse
+import atexit
+import collections
 import contextlib
 import dataclasses
+import functools
 import json
+import logging
 import os
 import re
+import statistics
 import sys
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from http import cookiejar
-from typing import Any
+from typing import Any, Iterator
 import httpx
 
+# Read and write JSON with orjson if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Stream large JSON files with ijson if available
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Import our custom implementations
 from utils.customlogger import CustomLogger
 from utils.filelock import FileLock
@@ -25,15 +44,20 @@ logger = CustomLogger()
 # -----------------------------
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class ConfigQBit:
     QUrl: str
     QUsername: str
     QPassword: str
-    Trackers: dict[str, str] = dataclasses.field(default_factory=dict)
+    # Tracker name to tag pairs, read with dict(Trackers)
+    Trackers: tuple[tuple[str, str], ...] = ()
 
+    def __post_init__(self):
+        # Freeze the tracker map into sorted pairs so the config stays hashable
+        object.__setattr__(self, "Trackers", tuple(sorted(dict(self.Trackers).items())))
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(slots=True, frozen=True)
 class ConfigLibrary:
     TypeName: str
     Url: str
@@ -49,13 +73,43 @@ class ConfigLibrary:
 
 
 def load_json(path: str) -> Any:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def iter_json_items(path: str) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array, streaming them with ijson when it is installed"""
+    if ijson is None:
+        data = load_json(path=path)
+        if isinstance(data, list):
+            yield from data
+        return
+    with open(path, "rb") as f:
+        # use_float keeps numbers as floats rather than Decimals so they serialize again
+        yield from ijson.items(f, "item", use_float=True)
 
 
 def save_json(path: str, data: Any) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is None:
+        content = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    else:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    # Write to a temp file and swap it in, so readers never see a partially written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
 
 
 # -----------------------------
@@ -63,22 +117,46 @@ def save_json(path: str, data: Any) -> None:
 # -----------------------------
 
 
+# Tracker name to tag, loaded from the qBit config when a client is created
+_TRACKER_TAGS: dict[str, str] = {}
+
+
+@functools.lru_cache(maxsize=256)
+def _tracker_tag(tracker_name: str) -> str:
+    return _TRACKER_TAGS.get(tracker_name, "")
+
+
+def create_session() -> httpx.Client:
+    """Create a pooled session that reuses connections across API calls and closes them on exit"""
+    transport = httpx.HTTPTransport(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60),
+        retries=2,
+    )
+    session = httpx.Client(transport=transport)
+    atexit.register(session.close)
+    return session
+
+
 class QBitClient:
     Name = "qBit"
     _session = None
     _authenticated = False
-    _tracker_tags = {}
+    # Recent search completion times in seconds, used to pace status polling
+    _search_times = collections.deque(maxlen=20)
     
     def __init__(self, config: ConfigQBit):
         self.config = config
-        # Store tracker tags at class level for access from class methods
-        QBitClient._tracker_tags = config.Trackers
+        # Store tracker tags at module level for access from class methods. The map is
+        # swapped in whole so a library running on another thread never sees it empty
+        global _TRACKER_TAGS
+        _TRACKER_TAGS = dict(config.Trackers)
+        _tracker_tag.cache_clear()
     
     @classmethod
     def _get_session(cls) -> httpx.Client:
         """Get or create singleton qBittorrent session"""
         if cls._session is None:
-            cls._session = httpx.Client()
+            cls._session = create_session()
         return cls._session
     
     def _login(self) -> None:
@@ -112,7 +190,7 @@ class QBitClient:
     @classmethod
     def get_tracker_tag(cls, tracker_name: str) -> str:
         """Get the tag for a specific tracker name"""
-        return cls._tracker_tags.get(tracker_name, "")
+        return _tracker_tag(tracker_name)
 
     def version(self) -> str:
         logger.info(f"🛜 Pinging {self.__class__.Name} server")
@@ -139,7 +217,8 @@ class QBitClient:
         resp = self.session.get(url, params=params, timeout=60)
         resp.raise_for_status()
         status_data = resp.json()[0]
-        logger.debug(f"🔍 Search job {job_id} reports {status_data.get('status', 'Unknown')} status with {status_data.get('total', 0)} results...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"🔍 Search job {job_id} reports {status_data.get('status', 'Unknown')} status with {status_data.get('total', 0)} results...")
         return status_data
 
     def search_results(self, job_id: int, limit: int = 0) -> list[dict[str, Any]]:
@@ -170,20 +249,31 @@ class QBitClient:
             timeout = 5
         elapsed = 0
         status = None
+        # Poll quickly at first and back off up to the wait interval
+        delay = self._initial_poll_delay(wait)
         while True:
             status = self.search_status(job_id)
             if status.get("status") == "Stopped":
+                QBitClient._search_times.append(elapsed)
                 return int(status.get("total", 0))
             if elapsed >= timeout:
                 with contextlib.suppress(Exception):
                     self.search_stop(job_id)
-            sleep_for = min(wait, max(0, timeout - elapsed))
+            sleep_for = min(delay, max(0, timeout - elapsed))
             if sleep_for <= 0:
                 break
             time.sleep(sleep_for)
             elapsed += sleep_for
+            delay = min(delay * 2, wait)
         status = self.search_status(job_id)
         return int(status.get("total", 0))
+
+    @classmethod
+    def _initial_poll_delay(cls, wait: int) -> float:
+        """Start polling at half the typical search time seen recently, or 0.5s with no history"""
+        if not cls._search_times:
+            return min(0.5, wait)
+        return min(max(0.5, statistics.median(cls._search_times) / 2), wait)
     
     def search(self, query: str, limit: int = 0, wait: int = 10, timeout: int = 30, whatif: bool = False) -> list[dict[str, Any]]:
         """Start a search, wait for it to complete, and return the results"""
@@ -194,6 +284,11 @@ class QBitClient:
         return self.search_results(job_id, limit=limit)
 
 
+# Attempts and backoff cap in seconds for transient Arr failures (5xx or connection errors)
+ARR_RETRY_ATTEMPTS = 5
+ARR_RETRY_MAX_DELAY = 30
+
+
 class ArrClient:
     _session = None
     
@@ -222,7 +317,7 @@ class ArrClient:
     def _get_session(cls) -> httpx.Client:
         """Get or create singleton Arr session"""
         if cls._session is None:
-            cls._session = httpx.Client()
+            cls._session = create_session()
         return cls._session
     
     @property
@@ -230,12 +325,26 @@ class ArrClient:
         """Get the session, always using singleton"""
         return self._get_session()
 
+    def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """GET with exponential backoff on server errors and dropped connections; 4xx errors raise immediately"""
+        for attempt in range(ARR_RETRY_ATTEMPTS):
+            try:
+                resp = self.session.get(url, **kwargs)
+                resp.raise_for_status()
+                return resp
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                server_error = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code >= 500
+                if not server_error or attempt == ARR_RETRY_ATTEMPTS - 1:
+                    raise
+                delay = min(0.5 * 2 ** attempt, ARR_RETRY_MAX_DELAY)
+                logger.warning(f"⏳ {self.config.TypeName} server request failed: {e}. Retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
     def status(self) -> dict[str, Any]:
         logger.info(f"🛜 Pinging {self.config.TypeName} Arr server")
         url = f"{self.config.Url}/api/v3/system/status"
         headers = {"X-Api-Key": self.config.ApiKey}
-        resp = self.session.get(url, headers=headers, timeout=30)
-        resp.raise_for_status()
+        resp = self._get(url, headers=headers, timeout=30)
         result = resp.json()
         logger.info(f"✅ Received ping response from {self.config.TypeName} Arr server")
         return result
@@ -245,8 +354,7 @@ class ArrClient:
         url = f"{self.config.Url}/api/v3/wanted/missing"
         headers = {"X-Api-Key": self.config.ApiKey}
         params = {"page": 1, "pageSize": page_size}
-        resp = self.session.get(url, headers=headers, params=params, timeout=60)
-        resp.raise_for_status()
+        resp = self._get(url, headers=headers, params=params, timeout=60)
         result = resp.json()
         logger.info(f"📺 Found {len(result.get('records', []))} missing {self.config.ProperNames.lower()}.")
         return result
@@ -256,8 +364,7 @@ class ArrClient:
         url = f"{self.config.Url}/api/v3/queue"
         headers = {"X-Api-Key": self.config.ApiKey}
         params = {"page": 1, "pageSize": page_size}
-        resp = self.session.get(url, headers=headers, params=params, timeout=60)
-        resp.raise_for_status()
+        resp = self._get(url, headers=headers, params=params, timeout=60)
         result = resp.json()
         logger.info(f"📺 Found {len(result.get('records', []))} queued {self.config.ProperNames.lower()}.")
         return result
@@ -270,8 +377,7 @@ class ArrClient:
         logger.info(f"🔍 Looking for {self.config.ProperName} using database {external_db}.")
         url = f"{self.config.Url}/api/v3/{self.config.Endpoint}?{external_db}Id={external_id}"
         headers = {"X-Api-Key": self.config.ApiKey}
-        resp = self.session.get(url, headers=headers, timeout=60)
-        resp.raise_for_status()
+        resp = self._get(url, headers=headers, timeout=60)
         logger.info(f"📺 Looked up {self.config.ProperName} from {self.config.TypeName} server: {resp.get('title')}")
         return resp.json()
 
@@ -279,8 +385,7 @@ class ArrClient:
         logger.info(f"🔍 Fetching {self.config.ProperName} from {self.config.TypeName} server.")
         url = f"{self.config.Url}/api/v3/{self.config.Endpoint}/{item_id}"
         headers = {"X-Api-Key": self.config.ApiKey}
-        resp = self.session.get(url, headers=headers, timeout=60)
-        resp.raise_for_status()
+        resp = self._get(url, headers=headers, timeout=60)
         data = resp.json()
         logger.info(f"📺 Fetched {self.config.ProperName} from {self.config.TypeName} server: {data.get('title')}")
         return data
@@ -302,101 +407,145 @@ class ArrClient:
 # -----------------------------
 
 
+# Jackett prefixes result names with the tracker name, e.g. "[Tracker] Name"
+JACKETT_PREFIX_RE = re.compile(r'^\[([^\]]+)\] ')
+# Resolutions that count towards the quality score
+QUALITY_RE = re.compile(r'1080p|2160p')
+
+# Score weights in feature order: seeds_10, sizeBest, favorite, seeds_50, quality
+SCORE_WEIGHTS = {
+    "Movies": (7, 5, 3, 2, 1),
+    "TV": (7, 5, 1, 3, 2),
+}
+
+
+def _score_kernel(sizes_mb: list[float], seeders: list[int], has_quality: list[bool], favorites: list[bool], runtime: int, weights: tuple[int, ...]) -> tuple[list[int], list[bool]]:
+    """Numeric part of optimize_results: per-result scores and the mask of results worth keeping"""
+    w_seeds_10, w_size_best, w_favorite, w_seeds_50, w_quality = weights
+    max_seeders = max(seeders, default=0) or 1
+    thr10, thr50 = 0.1 * max_seeders, 0.5 * max_seeders
+    size_min, size_max = 10 * runtime, 60 * runtime
+    best_min, best_max = 25 * runtime, 40 * runtime
+
+    # Score: weighted sum of boolean features, which never touch the result dicts
+    scores = [
+        w_seeds_10 * (nb_seeders >= thr10)
+        + w_size_best * (best_min <= MB_per_min <= best_max)
+        + w_favorite * favorite
+        + w_seeds_50 * (nb_seeders >= thr50)
+        + w_quality * quality
+        for MB_per_min, nb_seeders, quality, favorite in zip(sizes_mb, seeders, has_quality, favorites)
+    ]
+    keep = [score > 5 and size_min <= MB_per_min <= size_max for score, MB_per_min in zip(scores, sizes_mb)]
+    return scores, keep
+
+
 def optimize_results(results: list[dict[str, Any]], type_name: str, request_obj: Any) -> list[dict[str, Any]]:
-    max_seeders = max((r.get("nbSeeders", 0) for r in results), default=0) or 1
     if type_name == "Movies":
         runtime_default = 100
-        weights = {"seeds_10": 7, "sizeBest": 5, "favorite": 3, "seeds_50": 2, "quality": 1}
+        size_categories = ((25, "SD"), (60, "HD"))
         runtime = (request_obj or {}).get("runtime") or runtime_default
     elif type_name == "TV":
         runtime_default = 20
-        weights = {"seeds_10": 7, "sizeBest": 5, "seeds_50": 3, "quality": 2, "favorite": 1}
+        size_categories = ((25, "WEB-DL"), (40, "SD"), (60, "HD"))
         # TV runtime: sum of runtime of episodes in request_obj list
         if isinstance(request_obj, list):
             runtime = sum((ep.get("runtime") or runtime_default) for ep in request_obj)
         else:
             runtime = (request_obj or {}).get("runtime") or runtime_default
 
-    # Adjust Jackett names and private tracker tags
-    for r in results:
+    # Extract the columns once and scale the size thresholds by runtime
+    file_names = [r.get("fileName", "") for r in results]
+    sizes_mb = [float(r.get("fileSize", 0) or 1) / (1024 ** 2) for r in results]
+    seeders = [r.get("nbSeeders", 0) for r in results]
+    favorites = [r.get("siteUrl") == "https://torrents-csv.com" for r in results]
+    quality_search = QUALITY_RE.search
+    has_quality = [quality_search(file_name) is not None for file_name in file_names]
+    size_buckets = [(limit * runtime, category) for limit, category in size_categories]
+    now_iso = IsoTimeFormatter().to_string()
+
+    scores, keep = _score_kernel(
+        sizes_mb=sizes_mb, seeders=seeders, has_quality=has_quality, favorites=favorites,
+        runtime=runtime, weights=SCORE_WEIGHTS[type_name],
+    )
+
+    # Write the persisted fields only on the results that pass the filter
+    get_tracker_tag = QBitClient.get_tracker_tag
+    filtered = []
+    for r, file_name, MB_per_min, score, kept in zip(results, file_names, sizes_mb, scores, keep):
+        if not kept:
+            continue
+        # Adjust Jackett names and private tracker tags
         engine = r.get("engineName")
-        file_name = r.get("fileName", "")
-        tags = QBitClient.get_tracker_tag(engine)
+        tags = get_tracker_tag(engine)
         if engine == "jackett" and "] " in file_name:
-            jackett_match = re.search(r'^\[([^\]]+)\] ', file_name)
+            jackett_match = JACKETT_PREFIX_RE.search(file_name)
             if jackett_match:
                 jackett = jackett_match.group(1)
                 r["fileName"] = file_name[jackett_match.end():]
                 r["jackett"] = jackett
-                tags = QBitClient.get_tracker_tag(jackett)
-        r["tags"] = tags
-        r["lastAdded"] = IsoTimeFormatter().to_string()
-        MB_per_min = float(r.get("fileSize", 0) or 1) / (1024 ** 2)
-        r["fileSizeMB"] = MB_per_min
-        r["seeds_10"] = r.get("nbSeeders", 0) >= (0.1 * max_seeders)
-        r["seeds_50"] = r.get("nbSeeders", 0) >= (0.5 * max_seeders)
-        r["quality"] = any(q in file_name for q in ("1080p", "2160p"))
-        r["favorite"] = r.get("siteUrl") == "https://torrents-csv.com"
-        # Size heuristics
-        r["sizeMin"] = (10 * runtime) <= MB_per_min <= (60 * runtime)
-        r["sizeBest"] = (25 * runtime) <= MB_per_min <= (40 * runtime)
-        if type_name == "Movies":
-            if MB_per_min < 25 * runtime:
-                r["category"] = "SD"
-            elif 25 * runtime <= MB_per_min < 60 * runtime:
-                r["category"] = "HD"
-            else:
-                r["category"] = "UHD"
-        elif type_name == "TV":
-            if MB_per_min < 25 * runtime:
-                r["category"] = "WEB-DL"
-            elif 25 * runtime <= MB_per_min < 40 * runtime:
-                r["category"] = "SD"
-            elif 40 * runtime <= MB_per_min < 60 * runtime:
-                r["category"] = "HD"
-            else:
-                r["category"] = "UHD"
-        # Score
-        score = 0
-        for k, weight in weights.items():
-            if r.get(k):
-                score += weight
-        r["score"] = score
-
-    # Filter and sort
-    filtered = [r for r in results if r.get("score", 0) > 5 and r.get("sizeMin")]
+                tags = get_tracker_tag(jackett)
+        r.update(
+            tags=tags,
+            lastAdded=now_iso,
+            fileSizeMB=MB_per_min,
+            # Size heuristics: first bucket whose upper bound exceeds the size, else UHD
+            category=next((category for limit, category in size_buckets if MB_per_min < limit), "UHD"),
+            score=score,
+        )
+        filtered.append(r)
+
+    # Sort
     filtered.sort(key=lambda r: (r.get("score", 0), r.get("pubDate") or ""), reverse=True)
-    # Drop calc fields that should not persist
-    for r in filtered:
-        for k in ("seeds_10", "seeds_50", "quality", "favorite", "sizeMin", "sizeBest"):
-            r.pop(k, None)
     return filtered
 
 
 def publish_results(publish_path: str, retention_days: int, results: list[dict[str, Any]], whatif: bool = False) -> None:
-    existing: list[dict[str, Any]] = []
-    with contextlib.suppress(Exception):
-        existing = load_json(path=publish_path)
-        if not isinstance(existing, list):
-            existing = []
-
     cutoff = IsoTimeFormatter().subtract_days(days=retention_days)
+    cutoff_str = cutoff.to_string()
 
-    recent: dict[str, dict[str, Any]] = {}
-    for item in existing:
-        last = IsoTimeFormatter(item.get("lastAdded"))
-        if last >= cutoff:
-            recent[item.get("descrLink")] = item
-
-    # Build map by descrLink
-    for r in results:
-        recent[r.get("descrLink")] = r
+    dropped = 0
 
-    final = list(recent.values())
+    def keep_existing(item: dict[str, Any]) -> bool:
+        nonlocal dropped
+        last = item.get("lastAdded") or ""
+        # Stamps written by to_string() are fixed-width UTC and compare as strings
+        if len(last) == len(cutoff_str):
+            keep = last >= cutoff_str
+        else:
+            keep = IsoTimeFormatter(last) >= cutoff
+        if keep and item.get("descrLink"):
+            return True
+        dropped += 1
+        return False
+
+    # Stream existing records within retention straight into the map by descrLink,
+    # then let new results overwrite them. Records without a descrLink are dropped.
+    recent: dict[str, dict[str, Any]] = {}
+    read_ok = False
+    with contextlib.suppress(Exception):
+        recent.update(
+            (item["descrLink"], item)
+            for item in iter_json_items(path=publish_path)
+            if keep_existing(item)
+        )
+        read_ok = True
+    recent.update((r["descrLink"], r) for r in results if r.get("descrLink"))
+
+    # Nothing new and nothing expired: the file content is unchanged, so only
+    # bump its mtime for the refresh age check instead of rewriting every record
+    unchanged = read_ok and not dropped and not any(r.get("descrLink") for r in results)
     if whatif:
-        print(f"Would write {len(results)} new and {len(final)} total items to {publish_path}")
+        if unchanged:
+            print(f"Would touch {publish_path}, {len(recent)} items unchanged")
+        else:
+            print(f"Would write {len(results)} new and {len(recent)} total items to {publish_path}")
+        return
+    if unchanged:
+        os.utime(publish_path)
         return
     os.makedirs(os.path.dirname(publish_path), exist_ok=True)
+    final = list(recent.values())
     save_json(path=publish_path, data=final)
 
 
@@ -405,6 +554,20 @@ def publish_results(publish_path: str, retention_days: int, results: list[dict[s
 # -----------------------------
 
 
+# qBittorrent refuses to run more than 5 searches at once
+SEARCH_WORKERS = 4
+# Caps searches across every library running in this process, not just per pool
+_SEARCH_SLOTS = threading.BoundedSemaphore(SEARCH_WORKERS)
+# Concurrent lookups against the Arr API
+ARR_WORKERS = 8
+# Concurrent result optimization and torrent adds
+OPTIMIZE_WORKERS = 8
+# Movies and TV run side by side but publish to the same file
+_PUBLISH_LOCK = threading.Lock()
+# Exit code when --lock-timeout passes, so callers can tell a skipped run from a failed one
+EXIT_LOCKED = 2
+
+
 def init_library(name: str, config_path: str | None) -> tuple[QBitClient, ArrClient]:
     """Initialize library configuration and clients with health checks"""
     # Resolve config file default relative to this script
@@ -478,15 +641,22 @@ def run_for_library(name: str, config_path: str | None, publish_path: str, reten
     wanted = arr.wanted_missing(page_size=250)
     # Fetch queued videos
     queue = arr.queue(page_size=250)
-    queued = queue.get("records", [])
+    # Ids of queued movies and episodes still in progress, collected in one pass
+    queued_movie_ids: set[Any] = set()
+    queued_eps: set[Any] = set()
+    for q in queue.get("records", []):
+        if q.get("status") != "completed":
+            queued_movie_ids.add(q.get("movieId"))
+            queued_eps.add(q.get("episodeId"))
 
     # Collect all search requests
     search_requests: list[dict[str, Any]] = []
 
     if arr.TypeName == "Movies":
         for rec in wanted.get("records", []):
-            if queued and rec.get("id") in [q.get("movieId") for q in queued if q.get("status") != "completed"]:
-                logger.debug(f"🚫 Skipping queued {arr.ProperName.lower()} with status=completed: {rec.get('title')}")
+            if rec.get("id") in queued_movie_ids:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"🚫 Skipping queued {arr.ProperName.lower()} with status=completed: {rec.get('title')}")
                 continue
             logger.info(f"🧲 Grabbing {arr.ProperName.lower()}: {rec.get('title')}")
             search_requests.append({
@@ -501,15 +671,17 @@ def run_for_library(name: str, config_path: str | None, publish_path: str, reten
         by_series: dict[Any, list[dict[str, Any]]] = {}
         for rec in wanted.get("records", []):
             by_series.setdefault(rec.get("seriesId"), []).append(rec)
+        # Fetch every series up front instead of one request per loop iteration
+        with ThreadPoolExecutor(max_workers=ARR_WORKERS) as executor:
+            series_map = dict(zip(by_series, executor.map(lambda series_id: arr.get_video(item_id=str(series_id)), by_series)))
         for series_id, episodes in by_series.items():
-            series = arr.get_video(item_id=str(series_id))
+            series = series_map[series_id]
             # Filter missing episodes not already queued
             episodes_missing = []
-            queued_eps = {q.get("episodeId") for q in queued if q.get("status") != "completed"}
             for ep in episodes:
                 if ep.get("id") not in queued_eps:
                     episodes_missing.append(ep)
-                else:
+                elif logger.isEnabledFor(logging.DEBUG):
                     episode_label = f"S{ep.get('seasonNumber'):02d}E{ep.get('episodeNumber'):02d}"
                     logger.debug(f"🚫 Skipping queued {arr.ProperName.lower()} with status=completed: {episode_label}")
             if not episodes_missing:
@@ -544,49 +716,64 @@ def run_for_library(name: str, config_path: str | None, publish_path: str, reten
                             "series": series,
                         })
 
-    # Execute searches, optimize, optionally add top torrent
-    all_top: list[dict[str, Any]] = []
-    for item in search_requests:
+    # Execute searches concurrently, since each one mostly waits on qBittorrent
+    def search(item: dict[str, Any]) -> list[dict[str, Any]]:
+        with _SEARCH_SLOTS:
+            return qBit.search(query=item["string"], limit=0, wait=10, timeout=30, whatif=whatif)
+
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        search_results = list(executor.map(search, search_requests))
+
+    # Optimize, optionally add top torrent
+    def process(item: dict[str, Any], results: list[dict[str, Any]]) -> list[dict[str, Any]]:
         query = item["string"]
         match_pat = item.get("match")
         ignore_pat = item.get("ignore")
         request_obj = item.get("request")
         meta = item.get("meta", {})
 
-        results = qBit.search(query=query, limit=0, wait=10, timeout=30, whatif=whatif)
-        
         # Filter
+        match_re = re.compile(match_pat) if match_pat else None
+        ignore_re = re.compile(ignore_pat) if ignore_pat else None
         filtered: list[dict[str, Any]] = []
         for r in results:
             name_str = r.get("fileName") or ""
-            matched = (match_pat is None) or (match_pat and (match_pat in name_str or __import__("re").search(match_pat, name_str)))
+            matched = (match_pat is None) or (match_pat and (match_pat in name_str or match_re.search(name_str)))
             ignored = False
-            if ignore_pat:
-                ignored = bool(__import__("re").search(ignore_pat, name_str))
+            if ignore_re:
+                ignored = bool(ignore_re.search(name_str))
             errored = (r.get("fileSize") == -1)
             if matched and (not ignored) and (not errored):
                 filtered.append(r)
 
         optimized = optimize_results(results=filtered, type_name=arr.TypeName, request_obj=request_obj)
-        if optimized:
-            if do_qbit and not whatif:
-                top = optimized[0]
-                logger.info(f"🔍 Adding torrent to {QBitClient.Name} server: {top.get('fileName')}")
-                qBit.add_torrent(torrent_url=top.get("fileUrl"), rename=top.get("fileName"), tags=top.get("tags") or "", category=arr.TypeName)
-                logger.info(f"✅ Received torrent response from {QBitClient.Name} server")
-            elif do_qbit and whatif:
-                logger.info(f"📺 Would add {arr.ProperName.lower()} torrents to {QBitClient.Name} server: {optimized[0].get('fileName')}")
-            # add metadata to each optimized result
-            for k, v in meta.items():
-                for o in optimized:
-                    o[k] = v
-            all_top.extend(optimized)
-            logger.info(f"🎯 Found {len(optimized)} suitable torrents on {QBitClient.Name} server for request: {query}")
-        else:
+        if not optimized:
             logger.error(f"😵‍💫 No suitable {arr.ProperName.lower()} torrents found for request: {query}")
+            return []
+        if do_qbit and not whatif:
+            top = optimized[0]
+            logger.info(f"🔍 Adding torrent to {QBitClient.Name} server: {top.get('fileName')}")
+            qBit.add_torrent(torrent_url=top.get("fileUrl"), rename=top.get("fileName"), tags=top.get("tags") or "", category=arr.TypeName)
+            logger.info(f"✅ Received torrent response from {QBitClient.Name} server")
+        elif do_qbit and whatif:
+            logger.info(f"📺 Would add {arr.ProperName.lower()} torrents to {QBitClient.Name} server: {optimized[0].get('fileName')}")
+        # add metadata to each optimized result
+        for k, v in meta.items():
+            for o in optimized:
+                o[k] = v
+        logger.info(f"🎯 Found {len(optimized)} suitable torrents on {QBitClient.Name} server for request: {query}")
+        return optimized
+
+    # Overlap the add_torrent round trips with optimizing the other requests,
+    # collecting in request order so later duplicates still win when publishing
+    all_top: list[dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=OPTIMIZE_WORKERS) as executor:
+        for optimized in executor.map(process, search_requests, search_results):
+            all_top.extend(optimized)
 
     logger.info(f"📝 Writing {len(all_top)} total records to JSON file: {publish_path}")
-    publish_results(publish_path=publish_path, retention_days=retention_days, results=all_top, whatif=whatif)
+    with _PUBLISH_LOCK:
+        publish_results(publish_path=publish_path, retention_days=retention_days, results=all_top, whatif=whatif)
     arr.update_rss()
 
 
@@ -601,6 +788,7 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p.add_argument("--whatif", action="store_true", help="Dry-run mode. Simulates execution without making actual changes")
     p.add_argument("--noninteractive", action="store_true", help="Non-interactive mode does not print to console")
     p.add_argument("--log", action="store_true", help="Log all output for debugging. Enabling this option will significantly increase execution time.")
+    p.add_argument("--lock-timeout", type=float, default=-1, help="Seconds to wait for another running instance to finish before giving up. Defaults to -1 to wait indefinitely")
     return p.parse_args(argv)
 
 
@@ -664,8 +852,12 @@ def main(argv: list[str] | None = None) -> int:
             - Significantly increases execution time due to file I/O
             - Log file location is printed when logging is enabled
             
+        --lock-timeout: Seconds to wait for the instance lock
+            - Default: -1 (wait until the running instance finishes)
+            - When the timeout passes, the run is skipped and exits with EXIT_LOCKED (2)
+            
     Returns:
-        int: Exit code (0 for success)
+        int: Exit code (0 for success, 1 for failure, EXIT_LOCKED when skipped)
         
     Example Usage:
         # Test run for both libraries without making changes
@@ -687,19 +879,33 @@ def main(argv: list[str] | None = None) -> int:
     lock_path = os.path.join(tempfile.gettempdir(), f"{script_name}.lock")
     lock = FileLock(lock_path)
     
-    try:
+    if args.lock_timeout < 0:
         logger.info("🔒 Waiting for lock (blocking)...")
-        with lock:
-            logger.info("🔒 Lock acquired")
-            if args.name == "Both":
-                run_for_library(name="Movies", config_path=args.config, publish_path=args.publish, retention_days=args.retention, do_qbit=args.qbit, whatif=args.whatif)
-                run_for_library(name="TV", config_path=args.config, publish_path=args.publish, retention_days=args.retention, do_qbit=args.qbit, whatif=args.whatif)
-            else:
-                run_for_library(name=args.name, config_path=args.config, publish_path=args.publish, retention_days=args.retention, do_qbit=args.qbit, whatif=args.whatif)
+    else:
+        logger.info(f"🔒 Waiting up to {args.lock_timeout}s for lock...")
+    try:
+        lock.acquire(timeout=args.lock_timeout)
+    except TimeoutError:
+        logger.warning(f"⏳ Another instance still holds the lock after {args.lock_timeout}s, skipping this run")
+        logger.info("👋 Exiting script...")
+        return EXIT_LOCKED
+
+    try:
+        logger.info("🔒 Lock acquired")
+        names = ["Movies", "TV"] if args.name == "Both" else [args.name]
+        # Each library talks to its own Arr server, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            futures = [
+                executor.submit(run_for_library, name=name, config_path=args.config, publish_path=args.publish, retention_days=args.retention, do_qbit=args.qbit, whatif=args.whatif)
+                for name in names
+            ]
+            for future in futures:
+                future.result()
     except Exception as e:
         logger.error(f"❌ Script failed: {e}", exc_info=True)
         return 1
     finally:
+        lock.release()
         logger.info("🔓 Lock released")
         logger.info("👋 Exiting script...")
     
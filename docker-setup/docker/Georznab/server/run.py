@@ -1,26 +1,44 @@
 from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from routers import status, torznab, webhook
 import asyncio
+import contextlib
 import cron.rssrefresh
 from contextlib import asynccontextmanager
+from pathlib import Path
+from utils.customlogger import CustomLogger
+
+logger = CustomLogger()
+
+def log_task_exit(task: asyncio.Task) -> None:
+    """Log the RSS refresh cron job as soon as it dies, since the kept reference hides unretrieved errors."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"❌ RSS refresh cron job crashed: {task.exception()!r}", exc_info=task.exception())
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
     try:
-        # Start RSS refresh cron job in daemon mode
-        asyncio.create_task(cron.rssrefresh.main(["--daemon"]))
-        print("🚀 Background RSS refresh cron job started")
+        # Start RSS refresh cron job in daemon mode, keeping a reference so it is not garbage collected
+        app.state.rss_task = asyncio.create_task(cron.rssrefresh.main(["--daemon"]), name="rss-refresh")
+        app.state.rss_task.add_done_callback(log_task_exit)
+        logger.info("🚀 Background RSS refresh cron job started")
     except Exception as e:
-        print(f"❌ Failed to start RSS refresh cron job: {e}")
+        app.state.rss_task = None
+        logger.error(f"❌ Failed to start RSS refresh cron job: {e}")
     
     yield
     
     # Shutdown
-    print("🛑 Application shutting down")
+    logger.info("🛑 Application shutting down")
+    task = app.state.rss_task
+    if task is not None:
+        task.cancel()
+        # gather hands back the task's exception instead of raising it out of shutdown, and log_task_exit already reported any crash
+        await asyncio.gather(task, return_exceptions=True)
+        logger.info("🛑 Background RSS refresh cron job stopped")
 
 app = FastAPI(lifespan=lifespan)
 
@@ -29,11 +47,21 @@ app.include_router(status.router)
 app.include_router(torznab.router)
 app.include_router(webhook.router)
 
+STATIC_DIR = "/app/server/static"
+
 # Mount static directory
-app.mount("/static", StaticFiles(directory="/app/server/static"), name="static")
+app.mount("/static", StaticFiles(directory=STATIC_DIR, html=False, check_dir=False), name="static")
+
+# Favicon, read once at startup and served from memory
+_FAVICON_RESPONSE = Response(status_code=404)
+with contextlib.suppress(OSError):
+    _FAVICON_RESPONSE = Response(
+        content=Path(STATIC_DIR, "favicon.ico").read_bytes(),
+        media_type="image/x-icon",
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
 
-# Favicon
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
-    return FileResponse("/app/server/static/favicon.ico")
+    return _FAVICON_RESPONSE
 
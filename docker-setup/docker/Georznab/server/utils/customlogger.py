@@ -5,30 +5,46 @@ This module provides a CustomLogger class that extends Python's logging.Logger
 with emoji-based formatting for console output and detailed file logging.
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 import tempfile
+import threading
 import uuid
 
 
+# Log file handlers shared by every CustomLogger with the same name, opened once per process
+_HANDLER_CACHE: dict[str, logging.Handler] = {}
+_LOCK = threading.Lock()
+
+
 class EmojiFormatter(logging.Formatter):
     """Custom formatter that adds emojis based on log level."""
     
+    _EMOJI = {
+        logging.DEBUG: "🔍 ",
+        logging.INFO: "💡 ",
+        logging.WARNING: "⚠️ ",
+        logging.ERROR: "❌ ",
+        logging.CRITICAL: "🚨 ",
+    }
+    
     def format(self, record):
-        # Add emojis based on log level
-        if record.levelno == logging.DEBUG:
-            record.msg = f"🔍 {record.msg}"
-        elif record.levelno == logging.INFO:
-            record.msg = f"💡 {record.msg}"
-        elif record.levelno == logging.WARNING:
-            record.msg = f"⚠️ {record.msg}"
-        elif record.levelno == logging.ERROR:
-            record.msg = f"❌ {record.msg}"
-        elif record.levelno == logging.CRITICAL:
-            record.msg = f"🚨 {record.msg}"
-        
-        return super().format(record)
+        # Prefix the formatted output, leaving record.msg untouched for other handlers
+        return self._EMOJI.get(record.levelno, "") + super().format(record)
+
+
+# Formatters are stateless, so every logger and handler shares these instances
+_CONSOLE_FMT = EmojiFormatter('%(message)s')
+# Detailed formatter for file logging
+_FILE_FMT = logging.Formatter(
+    '[%(asctime)s *%(levelname)s*] %(message)s',
+    datefmt='%Y-%m-%dT%H:%M:%S.%fZ',
+    validate=False
+)
 
 
 class CustomLogger(logging.Logger):
@@ -57,30 +73,53 @@ class CustomLogger(logging.Logger):
             if not noninteractive:
                 console_handler = logging.StreamHandler(sys.stdout)
                 console_handler.setLevel(logging.INFO)
-                
-                console_formatter = EmojiFormatter('%(message)s')
-                console_handler.setFormatter(console_formatter)
+                console_handler.setFormatter(_CONSOLE_FMT)
                 self.addHandler(console_handler)
             
             # File handler (if logging enabled)
             if enable_log:
-                temp_dir = tempfile.gettempdir()
-                script_name = name
-                log_id = str(uuid.uuid4())[:8]
-                log_file = os.path.join(temp_dir, f"{script_name}-{log_id}.log")
+                with _LOCK:
+                    queue_handler = _HANDLER_CACHE.get(name)
+                    created = queue_handler is None
+                    if created:
+                        queue_handler, log_file = self._create_file_handler(name)
+                        _HANDLER_CACHE[name] = queue_handler
+                self.addHandler(queue_handler)
                 
-                file_handler = logging.FileHandler(log_file, encoding='utf-8')
-                file_handler.setLevel(logging.DEBUG)
-                
-                # Detailed formatter for file logging
-                file_formatter = logging.Formatter(
-                    '[%(asctime)s *%(levelname)s*] %(message)s',
-                    datefmt='%Y-%m-%dT%H:%M:%S.%fZ'
-                )
-                file_handler.setFormatter(file_formatter)
-                self.addHandler(file_handler)
-                
-                self.info(f"🔒 Logging enabled: {log_file}")
+                if created:
+                    self.info(f"🔒 Logging enabled: {log_file}")
+            
+            # Drop records no handler wants before they are built. Without handlers,
+            # records fall through to logging.lastResort, which only shows warnings
+            self.setLevel(min((handler.level for handler in self.handlers), default=logging.WARNING))
+
+    @staticmethod
+    def _create_file_handler(name: str) -> tuple[logging.Handler, str]:
+        """Open the log file once and return a queue handler feeding it from a background thread."""
+        temp_dir = tempfile.gettempdir()
+        script_name = name
+        log_id = str(uuid.uuid4())[:8]
+        log_file = os.path.join(temp_dir, f"{script_name}-{log_id}.log")
+        
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(_FILE_FMT)
+        
+        # Buffer records and write them in batches, flushing right away on errors
+        memory_handler = logging.handlers.MemoryHandler(capacity=512, flushLevel=logging.ERROR, target=file_handler)
+        memory_handler.setLevel(logging.DEBUG)
+        
+        # Hand records to a background thread so disk writes never block the caller
+        log_queue = queue.Queue(-1)
+        listener = logging.handlers.QueueListener(log_queue, memory_handler, respect_handler_level=True)
+        listener.start()
+        # atexit runs in reverse: stop the listener to drain the queue, flush the buffer, then close the file
+        atexit.register(file_handler.close)
+        atexit.register(memory_handler.close)
+        atexit.register(listener.stop)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(logging.DEBUG)
+        return queue_handler, log_file
 
 
 def setup_logging(noninteractive: bool = False, enable_log: bool = False) -> CustomLogger:
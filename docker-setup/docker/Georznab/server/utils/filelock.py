@@ -7,14 +7,36 @@ filelock library if available, otherwise falls back to a custom implementation
 using OS-level locking primitives.
 """
 
-import contextlib
 import os
 import sys
 import time
 from typing import Optional
 
 
- 
+# Bind the OS-level locking primitives once for the fallback implementation
+if sys.platform.startswith('win'):
+    # Windows: use msvcrt for file locking, which has no blocking exclusive mode
+    import msvcrt
+
+    def _lock_nb(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    _lock_blocking = None
+else:
+    # Unix/Linux: use fcntl for file locking
+    import fcntl
+
+    def _lock_nb(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _lock_blocking(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
 
 
 # Try to import the filelock library first
@@ -56,62 +78,62 @@ except ImportError:
             Raises:
                 TimeoutError: If timeout is reached and lock cannot be acquired.
             """
-            wait_seconds = 0
-            
-            while True:
-                try:
-                    # Open the file for writing
-                    self._fd = os.open(self.lock_file, os.O_CREAT | os.O_RDWR)
-                    
-                    # Try to acquire an exclusive lock
-                    if sys.platform.startswith('win'):
-                        # Windows: use msvcrt for file locking
-                        import msvcrt
-                        msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+            # Open the lock file once and wait on the same descriptor
+            self._fd = os.open(self.lock_file, os.O_CREAT | os.O_WRONLY, 0o644)
+            try:
+                if not self._try_lock():
+                    if timeout == -1 and _lock_blocking is not None:
+                        # Block in the kernel, which wakes us as soon as the holder releases
+                        print("Another instance is running. Waiting...", file=sys.stderr)
+                        _lock_blocking(self._fd)
                     else:
-                        # Unix/Linux: use fcntl for file locking
-                        import fcntl
-                        fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    
-                    # Write PID to lock file for debugging
-                    os.write(self._fd, str(os.getpid()).encode())
-                    os.fsync(self._fd)
-                    self._locked = True
-                    return
-                    
-                except (OSError, IOError) as e:
-                    if self._fd is not None:
-                        os.close(self._fd)
-                        self._fd = None
-                    
-                    # Only check timeout if it's explicitly set (not -1)
-                    if timeout != -1 and wait_seconds >= timeout:
-                        raise TimeoutError(f"Could not acquire lock within {timeout} seconds")
-                    
-                    wait_seconds += 1
-                    print(f"Another instance has been running for {wait_seconds} seconds. Waiting...", file=sys.stderr)
-                    time.sleep(1)
+                        self._poll_lock(timeout)
+            except BaseException:
+                os.close(self._fd)
+                self._fd = None
+                raise
+
+            # Write PID to lock file for debugging. Truncate only now that we hold the
+            # lock, so waiters never wipe the holder's PID, and skip fsync as it is advisory
+            os.ftruncate(self._fd, 0)
+            os.write(self._fd, str(os.getpid()).encode())
+            self._locked = True
+
+        def _try_lock(self) -> bool:
+            """Try once to take the lock without blocking."""
+            try:
+                _lock_nb(self._fd)
+                return True
+            except (OSError, IOError):
+                return False
+
+        def _poll_lock(self, timeout: float) -> None:
+            """Retry the lock at a short interval, for Windows or a finite timeout."""
+            start = time.monotonic()
+            last_notice = start
+            while not self._try_lock():
+                now = time.monotonic()
+                # Only check timeout if it's explicitly set (not -1)
+                if timeout != -1 and now - start >= timeout:
+                    raise TimeoutError(f"Could not acquire lock within {timeout} seconds")
+                if now - last_notice >= 10:
+                    last_notice = now
+                    print(f"Another instance has been running for {int(now - start)} seconds. Waiting...", file=sys.stderr)
+                time.sleep(0.05)
 
         def release(self) -> None:
             """Release the file lock."""
             if self._fd is not None and self._locked:
                 try:
-                    if sys.platform.startswith('win'):
-                        import msvcrt
-                        msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
-                    else:
-                        import fcntl
-                        fcntl.flock(self._fd, fcntl.LOCK_UN)
+                    _unlock(self._fd)
                 except (OSError, IOError):
                     pass
                 finally:
                     os.close(self._fd)
                     self._fd = None
                     self._locked = False
-                    
-            # Clean up the lock file
-            with contextlib.suppress(FileNotFoundError, OSError):
-                os.remove(self.lock_file)
+            # The lock file is left in place: removing it after unlocking lets a
+            # waiter lock the old inode while a newcomer locks a fresh file
 
         def __enter__(self):
             """Context manager entry."""
@@ -1,26 +1,53 @@
+from functools import lru_cache
 from pathlib import Path
 import json
 import os
 import uuid
 
+# Read and write settings with orjson if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=4)
+def _load_raw(path: str, mtime_ns: int) -> dict[str, str]:
+    """Parse the settings file. The mtime is part of the cache key so edits to the file are picked up."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
 def load_settings(defaults: dict[str, str], keys: list[str]) -> dict[str, str]:
     """Accepts a dict containing strings for named global variables. Will not accept user variables not found in the default config."""
     # Load user config if it exists
     config_file = Path(os.getenv("SETTINGS_JSON", "/app/config/settings.json"))
-    if config_file.exists():
-        with config_file.open() as f:
-            user_config = json.load(f)
-    else:
+    try:
+        mtime_ns = config_file.stat().st_mtime_ns
+    except FileNotFoundError:
         user_config = {}
+    else:
+        # Copy so generated keys never leak into the cached dict
+        user_config = dict(_load_raw(str(config_file), mtime_ns))
 
     # Generate random UUID if a required key is missing or empty
-    for gen_key in keys:
-        if not user_config.get(gen_key):
-            user_config[gen_key] = str(uuid.uuid4())
-            # Save updated config back to file
-            config_file.parent.mkdir(parents=True, exist_ok=True)  # ensure directory exists
-            with config_file.open("w") as f:
-                json.dump(user_config, f, indent=2)
+    generated = [gen_key for gen_key in keys if not user_config.get(gen_key)]
+    for gen_key in generated:
+        user_config[gen_key] = str(uuid.uuid4())
+    if generated:
+        # Save updated config back to file once for all generated keys
+        config_file.parent.mkdir(parents=True, exist_ok=True)  # ensure directory exists
+        if orjson is None:
+            content = json.dumps(user_config, indent=2).encode("utf-8")
+        else:
+            content = orjson.dumps(user_config, option=orjson.OPT_INDENT_2)
+        # Write beside the file and swap it in, so a crash never leaves an empty config
+        tmp_file = config_file.with_name(config_file.name + ".tmp")
+        tmp_file.write_bytes(content)
+        os.replace(tmp_file, config_file)
+        _load_raw.cache_clear()
+        for gen_key in generated:
             print(f"Generated new {gen_key} and saved to {config_file}")
 
     # Only take keys from user_config that exist in defaults
@@ -1,37 +1,68 @@
-import contextlib
 import datetime as dt
-from functools import total_ordering
+from functools import lru_cache
+
+
+_UTC = dt.timezone.utc
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> dt.datetime:
+    """Parse an ISO string once per distinct value, assuming UTC when tz-naive"""
+    parsed = dt.datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=_UTC)
+
+
+def _to_dt(x: object | None) -> dt.datetime | None:
+    """Resolve a comparison operand to a datetime, parsing strings like the constructor does"""
+    if isinstance(x, IsoTimeFormatter):
+        return x.dt
+    if isinstance(x, dt.datetime):
+        return x
+    if isinstance(x, str):
+        if x:
+            try:
+                return _parse_iso(x)
+            except ValueError:
+                pass
+        # Blank or unparseable strings mean now, as in the constructor
+        return dt.datetime.now(_UTC)
+    return None
 
 
-@total_ordering
 class IsoTimeFormatter:
     """Utility for working with ISO-8601 UTC timestamps.
 
     - Constructor accepts an ISO string or blank string ("") for now (UTC)
-    - to_string() returns ISO string for the stored datetime
+    - to_string() returns a fixed-width UTC ISO string for the stored datetime,
+      so strings from it order the same as the datetimes they represent
     - compare() compares datetimes or ISO strings
     - subtract_days() returns a new instance shifted by the given days
     """
 
+    # dt is the stored datetime and _ts its POSIX timestamp, kept in sync
+    __slots__ = ("dt", "_ts")
+
     def __init__(self, value: str | None = None):
         if not value:  # None or ""
-            self.dt = dt.datetime.utcnow().replace(tzinfo=dt.timezone.utc)
+            self.dt = dt.datetime.now(_UTC)
         else:
-            parsed: dt.datetime | None = None
-            with contextlib.suppress(Exception):
+            try:
                 parsed = dt.datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                parsed = None
             # Default to now if parsing failed
             if parsed is None:
-                parsed = dt.datetime.utcnow().replace(tzinfo=dt.timezone.utc)
+                parsed = dt.datetime.now(_UTC)
             # Assume UTC if tz-naive
             if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=dt.timezone.utc)
+                parsed = parsed.replace(tzinfo=_UTC)
             self.dt = parsed
+        self._ts = self.dt.timestamp()
 
     def to_string(self) -> str:
         if self.dt is None:
             return ""
-        return self.dt.isoformat()
+        return self.dt.astimezone(_UTC).isoformat(timespec="microseconds")
 
     @staticmethod
     def compare(a: object | None, b: object | None) -> int:
@@ -39,18 +70,7 @@ class IsoTimeFormatter:
 
         Returns -1 if a<b, 0 if equal, 1 if a>b. None sorts before values.
         """
-        def to_dt(x: object | None) -> dt.datetime | None:
-            if x is None:
-                return None
-            if isinstance(x, dt.datetime):
-                return x
-            if isinstance(x, IsoTimeFormatter):
-                return x.dt
-            if isinstance(x, str):
-                return IsoTimeFormatter(x).dt
-            return None
-
-        da, db = to_dt(a), to_dt(b)
+        da, db = _to_dt(a), _to_dt(b)
         if da is None and db is None:
             return 0
         if da is None:
@@ -68,43 +88,52 @@ class IsoTimeFormatter:
             return IsoTimeFormatter("")
         return_obj = IsoTimeFormatter()
         return_obj.dt = (self.dt - dt.timedelta(days=days))
+        return_obj._ts = return_obj.dt.timestamp()
         return return_obj
 
     def _as_dt(self) -> dt.datetime | None:
         return self.dt
 
+    def _operands(self, other: object):
+        """Comparable values for self and other: timestamps for two formatters, datetimes otherwise.
+
+        Returns None when other is None and NotImplemented for unsupported types.
+        """
+        if isinstance(other, IsoTimeFormatter):
+            return self._ts, other._ts
+        if isinstance(other, (dt.datetime, str)):
+            return self.dt, _to_dt(other)
+        if other is None:
+            return None
+        return NotImplemented
+
+    # Each operator makes a single comparison. None sorts before every value.
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, (IsoTimeFormatter, dt.datetime, str, type(None))):
+        operands = self._operands(other)
+        if operands is NotImplemented:
             return NotImplemented
-        def to_dt(x):
-            if isinstance(x, IsoTimeFormatter):
-                return x.dt
-            if isinstance(x, dt.datetime):
-                return x
-            if isinstance(x, str):
-                return IsoTimeFormatter(x).dt
-            return None
-        a, b = to_dt(self), to_dt(other)
-        return a == b
+        return operands is not None and operands[0] == operands[1]
 
     def __lt__(self, other: object) -> bool:
-        if not isinstance(other, (IsoTimeFormatter, dt.datetime, str, type(None))):
+        operands = self._operands(other)
+        if operands is NotImplemented:
             return NotImplemented
-        def to_dt(x):
-            if isinstance(x, IsoTimeFormatter):
-                return x.dt
-            if isinstance(x, dt.datetime):
-                return x
-            if isinstance(x, str):
-                return IsoTimeFormatter(x).dt
-            return None
-        a, b = to_dt(self), to_dt(other)
-        if a is None and b is None:
-            return False
-        if a is None:
-            return True
-        if b is None:
-            return False
-        return a < b
+        return operands is not None and operands[0] < operands[1]
 
+    def __le__(self, other: object) -> bool:
+        operands = self._operands(other)
+        if operands is NotImplemented:
+            return NotImplemented
+        return operands is not None and operands[0] <= operands[1]
+
+    def __gt__(self, other: object) -> bool:
+        operands = self._operands(other)
+        if operands is NotImplemented:
+            return NotImplemented
+        return operands is None or operands[0] > operands[1]
 
+    def __ge__(self, other: object) -> bool:
+        operands = self._operands(other)
+        if operands is NotImplemented:
+            return NotImplemented
+        return operands is None or operands[0] >= operands[1]